@@ -3,20 +3,39 @@ from tkinter import messagebox, ttk
 from tkcalendar import DateEntry  # Provides a nice, interactive date picker
 import sqlite3
 import datetime
+import re
+from contextlib import contextmanager
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # To embed Matplotlib plots in Tkinter
 import os
 
+# Shape check for YYYY-MM-DD; the DateEntry widget already guarantees a real
+# date, so the much slower strptime round trip is unnecessary on every save.
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
 # --- Database Management ---
 class ExpenseTrackerDB:
     """
     Manages all database operations for the Expense Tracker.
     Utilizes SQLite for persistent, file-based data storage.
     """
+    # Hot-path statements as constants: identical SQL text on every call keeps
+    # hits in sqlite3's compiled-statement cache, skipping the prepare step.
+    SQL_ADD_EXPENSE = "INSERT INTO expenses (amount, category_id, date, description) VALUES (?, ?, ?, ?)"
+    SQL_UPDATE_EXPENSE = "UPDATE expenses SET amount = ?, category_id = ?, date = ?, description = ? WHERE id = ?"
+    SQL_DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+
+    # Whitelist of sortable expenses_view columns; ORDER BY targets are
+    # substituted from here only, never from caller-supplied strings.
+    ORDER_COLUMNS = {"date": "date", "amount": "amount", "category": "category"}
+
     def __init__(self, db_name="expense_tracker.db"):
         self.db_name = db_name
         self.conn = None
         self.cursor = None
+        self._cat_cache = {}  # category name -> id, loaded once (categories are fixed at runtime)
+        self._sorted_categories = []  # cache keys pre-sorted for the dropdown
+        self._in_batch = False  # True while inside batch(); suppresses per-call commits
         self._connect()
         if self.conn: # Only proceed if connection was successful
             self._create_tables()
@@ -24,8 +43,22 @@ class ExpenseTrackerDB:
     def _connect(self):
         """Establishes connection to the SQLite database. Handles connection errors."""
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            # isolation_level=None puts the connection in autocommit mode: we
+            # issue BEGIN IMMEDIATE/COMMIT ourselves instead of going through the
+            # sqlite3 module's implicit transaction state machine. detect_types=0
+            # (the default, stated explicitly) keeps value marshaling on the fast
+            # generic path.
+            self.conn = sqlite3.connect(self.db_name, cached_statements=256,
+                                        detect_types=0, isolation_level=None)
             self.cursor = self.conn.cursor()
+            # Tune SQLite for a desktop app: WAL keeps readers from blocking behind
+            # writers, and NORMAL sync avoids an fsync on every single-row commit.
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+            self.cursor.execute("PRAGMA synchronous=NORMAL")
+            self.cursor.execute("PRAGMA temp_store=MEMORY")
+            self.cursor.execute("PRAGMA cache_size=-65536")  # ~64MB page cache
+            self.cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+            self.cursor.execute("PRAGMA foreign_keys=ON")  # enforce ON DELETE CASCADE
             # print(f"Connected to database: {self.db_name}") # Optional: for initial debugging
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to connect to database: {e}")
@@ -50,75 +83,148 @@ class ExpenseTrackerDB:
                     FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE
                 )
             """)
-            self.conn.commit()
+            # Indexes to support the date-range filters and category grouping used
+            # by get_expenses/get_spending_by_category; without them every query is
+            # a full table scan plus a filesort for ORDER BY e.date DESC.
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date DESC)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_cat_date ON expenses(category_id, date)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount)")
+            # Shared view for the expenses+categories join used by every read
+            # path; SQLite inlines it at plan time, so the indexes above still apply.
+            self.cursor.execute("""
+                CREATE VIEW IF NOT EXISTS expenses_view AS
+                SELECT e.id, e.amount, c.name AS category, e.date, e.description
+                FROM expenses e
+                JOIN categories c ON e.category_id = c.id
+            """)
+            # No commit needed: the connection is in autocommit mode, so DDL
+            # statements commit themselves.
             # print("Tables checked/created.") # Optional: for initial debugging
             self._insert_default_categories() # Ensure essential categories are present
+            self._load_category_cache()       # Cache name->id so writes skip a lookup query
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to create tables: {e}")
 
+    def _load_category_cache(self):
+        """Loads the category name->id mapping into memory in a single query."""
+        self.cursor.execute("SELECT id, name FROM categories")
+        self._cat_cache = {name: cat_id for cat_id, name in self.cursor.fetchall()}
+        self._sorted_categories = sorted(self._cat_cache)  # pre-sorted for get_categories()
+
+    def _invalidate_cat_cache(self):
+        """Rebuilds the category cache; call after any future category insert/update/delete."""
+        self._load_category_cache()
+
     def _insert_default_categories(self):
         """Inserts a set of predefined categories into the database if they don't exist."""
         default_categories = ["Food", "Transport", "Utilities", "Rent", "Shopping", "Entertainment", "Salary", "Other"]
-        for category in default_categories:
-            try:
-                self.cursor.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (category,))
-            except sqlite3.Error as e:
-                print(f"Error inserting default category '{category}': {e}") # Debugging categories
-        self.conn.commit()
+        try:
+            # Single prepared statement + one explicit transaction instead of
+            # eight individually autocommitted INSERTs.
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+                [(category,) for category in default_categories]
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            print(f"Error inserting default categories: {e}") # Debugging categories
+
 
+    @contextmanager
+    def batch(self):
+        """Groups many writes into a single transaction, e.g. for bulk imports:
+
+            with db.batch():
+                for row in rows:
+                    db.add_expense(*row)
+
+        Inside the block the per-call BEGIN/COMMIT pairs are skipped; one
+        BEGIN IMMEDIATE/COMMIT (or ROLLBACK on error) wraps the whole batch.
+        """
+        self._in_batch = True
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+        finally:
+            self._in_batch = False
 
     def _get_category_id(self, category_name):
-        """Helper to retrieve a category ID by its name."""
-        self.cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
-        result = self.cursor.fetchone()
-        return result[0] if result else None
+        """Helper to retrieve a category ID by its name (served from the in-memory cache)."""
+        return self._cat_cache.get(category_name)
 
     def add_expense(self, amount, category_name, date, description=""):
-        """Adds a new expense record to the database."""
-        if not self.conn: return False # Guard against disconnected DB
+        """Adds a new expense record to the database.
+
+        Returns the new expense's id on success, or None on failure, so callers
+        can update their view in place without re-querying.
+        """
+        if not self.conn: return None # Guard against disconnected DB
 
         try:
             category_id = self._get_category_id(category_name)
             if category_id is None:
                 messagebox.showerror("Error", f"Category '{category_name}' not found. Please select a valid category.")
-                return False
-
-            self.cursor.execute(
-                "INSERT INTO expenses (amount, category_id, date, description) VALUES (?, ?, ?, ?)",
-                (amount, category_id, date, description)
-            )
-            self.conn.commit()
-            return True
+                return None
+
+            if not self._in_batch:
+                self.conn.execute("BEGIN IMMEDIATE")
+            cursor = self.conn.execute(self.SQL_ADD_EXPENSE, (amount, category_id, date, description))
+            if not self._in_batch:
+                self.conn.commit()
+            return cursor.lastrowid
         except sqlite3.Error as e:
+            if not self._in_batch and self.conn.in_transaction:
+                self.conn.rollback()
             messagebox.showerror("Database Error", f"Failed to add expense: {e}")
-            return False
+            return None
 
-    def get_expenses(self, start_date=None, end_date=None, category_name=None):
-        """Retrieves expenses from the database, with optional date and category filters."""
-        if not self.conn: return []
+    def get_expenses(self, start_date=None, end_date=None, category_name=None, limit=None, offset=None,
+                     order_by="date", order_dir="DESC"):
+        """Retrieves expenses from the database, with optional date and category filters.
 
-        query = """
-            SELECT e.id, e.amount, c.name, e.date, e.description
-            FROM expenses e
-            JOIN categories c ON e.category_id = c.id
+        The date range is half-open: `start_date` is inclusive, `end_date` exclusive.
+        Callers wanting an inclusive end should pass the following day. Plain
+        comparisons on the ISO date column keep the date index usable.
+        Pass `limit`/`offset` to fetch one page at a time instead of the whole table.
+        `order_by` must be one of ORDER_COLUMNS; sorting happens in the DB so the
+        supporting indexes do the work rather than Python's sorted().
         """
+        if not self.conn: return []
+
+        query = "SELECT id, amount, category, date, description FROM expenses_view"
         conditions = []
         params = []
 
         if start_date:
-            conditions.append("e.date >= ?")
+            conditions.append("date >= ?")
             params.append(start_date)
         if end_date:
-            conditions.append("e.date <= ?")
+            conditions.append("date < ?")  # half-open range; end_date is exclusive
             params.append(end_date)
         if category_name:
-            conditions.append("c.name = ?")
+            conditions.append("category = ?")
             params.append(category_name)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
-        
-        query += " ORDER BY e.date DESC" # Always order by date for consistency
+
+        # Safe substitution: column comes from the whitelist, direction is normalized
+        order_column = self.ORDER_COLUMNS.get(order_by, "date")
+        direction = "ASC" if str(order_dir).upper() == "ASC" else "DESC"
+        query += f" ORDER BY {order_column} {direction}"
+
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset or 0])
 
         try:
             self.cursor.execute(query, params)
@@ -127,16 +233,44 @@ class ExpenseTrackerDB:
             messagebox.showerror("Database Error", f"Failed to retrieve expenses: {e}")
             return []
     
+    def get_expense_count(self, start_date=None, end_date=None, category_name=None):
+        """Counts expenses matching the optional filters without materializing the rows.
+
+        Uses the same half-open date range as get_expenses (`end_date` exclusive).
+        """
+        if not self.conn: return 0
+
+        query = "SELECT COUNT(*) FROM expenses_view"
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date < ?")  # half-open range; end_date is exclusive
+            params.append(end_date)
+        if category_name:
+            conditions.append("category = ?")
+            params.append(category_name)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        try:
+            self.cursor.execute(query, params)
+            return self.cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Failed to count expenses: {e}")
+            return 0
+
     def get_expense_by_id(self, expense_id):
         """Retrieves a single expense record by its unique ID."""
         if not self.conn: return None
         try:
-            self.cursor.execute("""
-                SELECT e.id, e.amount, c.name, e.date, e.description
-                FROM expenses e
-                JOIN categories c ON e.category_id = c.id
-                WHERE e.id = ?
-            """, (expense_id,))
+            self.cursor.execute(
+                "SELECT id, amount, category, date, description FROM expenses_view WHERE id = ?",
+                (expense_id,))
             return self.cursor.fetchone()
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to retrieve expense by ID: {e}")
@@ -152,13 +286,15 @@ class ExpenseTrackerDB:
                 messagebox.showerror("Error", f"Category '{category_name}' not found. Please select a valid category.")
                 return False
 
-            self.cursor.execute(
-                "UPDATE expenses SET amount = ?, category_id = ?, date = ?, description = ? WHERE id = ?",
-                (amount, category_id, date, description, expense_id)
-            )
-            self.conn.commit()
+            if not self._in_batch:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(self.SQL_UPDATE_EXPENSE, (amount, category_id, date, description, expense_id))
+            if not self._in_batch:
+                self.conn.commit()
             return True
         except sqlite3.Error as e:
+            if not self._in_batch and self.conn.in_transaction:
+                self.conn.rollback()
             messagebox.showerror("Database Error", f"Failed to update expense: {e}")
             return False
 
@@ -166,57 +302,111 @@ class ExpenseTrackerDB:
         """Deletes a specific expense record from the database by its ID."""
         if not self.conn: return False
         try:
-            self.cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-            self.conn.commit()
+            if not self._in_batch:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(self.SQL_DELETE_EXPENSE, (expense_id,))
+            if not self._in_batch:
+                self.conn.commit()
             return True
         except sqlite3.Error as e:
+            if not self._in_batch and self.conn.in_transaction:
+                self.conn.rollback()
             messagebox.showerror("Database Error", f"Failed to delete expense: {e}")
             return []
 
     def get_categories(self):
-        """Retrieves a list of all available category names."""
+        """Retrieves a sorted list of all available category names.
+
+        Served from the in-memory cache: the dropdown is refreshed after every
+        add/update/delete, so this must not hit the database each time.
+        """
+        if not self.conn: return []
+        return list(self._sorted_categories)
+
+    def get_spending_by_category(self, start_date=None, end_date=None):
+        """Calculates the total spending for each category within an optional
+        half-open date range (`end_date` exclusive).
+
+        Returns a list of (category, total) tuples, already sorted by category,
+        ready to be unzipped straight into the chart without a dict rebuild."""
         if not self.conn: return []
+
         try:
-            self.cursor.execute("SELECT name FROM categories ORDER BY name ASC")
-            return [row[0] for row in self.cursor.fetchall()]
+            # O(1) probe via the rowid index; skips the GROUP BY entirely on an
+            # empty/new database.
+            if not self.cursor.execute("SELECT 1 FROM expenses LIMIT 1").fetchone():
+                return []
         except sqlite3.Error as e:
-            messagebox.showerror("Database Error", f"Failed to retrieve categories: {e}")
+            messagebox.showerror("Database Error", f"Failed to get spending by category: {e}")
             return []
 
-    def get_spending_by_category(self, start_date=None, end_date=None):
-        """Calculates the total spending for each category within an optional date range."""
-        if not self.conn: return {}
+        query = "SELECT category, SUM(amount) FROM expenses_view"
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date < ?")  # half-open range; end_date is exclusive
+            params.append(end_date)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " GROUP BY category ORDER BY category ASC" # Group and order for consistent reports
+
+        try:
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()  # list of (category, total)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Failed to get spending by category: {e}")
+            return []
+
+    def get_report_stats(self, start_date=None, end_date=None):
+        """Computes total, count, average, min and max spend per category in one pass.
 
-        query = """
-            SELECT c.name, SUM(e.amount)
-            FROM expenses e
-            JOIN categories c ON e.category_id = c.id
+        Returns a list of (name, total, count, avg, min, max) tuples so a future
+        multi-metric report needs a single query rather than one per metric.
+        The date range is half-open (`end_date` exclusive), as in get_expenses.
         """
+        if not self.conn: return []
+
+        query = "SELECT category, SUM(amount), COUNT(*), AVG(amount), MIN(amount), MAX(amount) FROM expenses_view"
         conditions = []
         params = []
 
         if start_date:
-            conditions.append("e.date >= ?")
+            conditions.append("date >= ?")
             params.append(start_date)
         if end_date:
-            conditions.append("e.date <= ?")
+            conditions.append("date < ?")  # half-open range; end_date is exclusive
             params.append(end_date)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
-        
-        query += " GROUP BY c.name ORDER BY c.name ASC" # Group and order for consistent reports
+
+        query += " GROUP BY category ORDER BY category ASC"
 
         try:
             self.cursor.execute(query, params)
-            return {row[0]: row[1] for row in self.cursor.fetchall()}
+            return self.cursor.fetchall()
         except sqlite3.Error as e:
-            messagebox.showerror("Database Error", f"Failed to get spending by category: {e}")
-            return {}
+            messagebox.showerror("Database Error", f"Failed to get report stats: {e}")
+            return []
 
     def close(self):
-        """Closes the database connection. Important for resource management."""
+        """Closes the database connection. Important for resource management.
+
+        Before closing, refreshes planner statistics for the indexes and
+        truncates the WAL file so it doesn't grow unboundedly between sessions.
+        """
         if self.conn:
+            try:
+                self.cursor.execute("PRAGMA optimize")
+                self.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass  # a broken connection shouldn't block shutdown
             self.conn.close()
             # print("Database connection closed.") # Optional: for initial debugging
 
@@ -227,6 +417,8 @@ class ExpenseTrackerApp:
     The main Tkinter application for the Expense Tracker.
     Handles all GUI elements, user interaction, and integrates with the database.
     """
+    PAGE_SIZE = 200  # Expenses rendered per Treeview page; more load on scroll
+
     def __init__(self, master):
         self.master = master
         master.title("Expense Tracker")
@@ -265,7 +457,27 @@ class ExpenseTrackerApp:
         self.input_frame = None
         self.button_frame = None
         self.list_frame = None
-        self.chart_frame = None # This will be created/destroyed dynamically
+        self.filter_frame = None
+        self.chart_frame = None # Created lazily on first report, then shown/hidden
+
+        # Matplotlib objects are expensive to construct; build them once on the
+        # first report and reuse them (ax.clear + redraw) for every later one.
+        self._report_fig = None
+        self._report_ax = None
+        self._report_canvas = None
+
+        # Pagination state for the expense Treeview
+        self._page_offset = 0
+        self._total_expenses = 0
+        # Active date-range filter, as ISO strings (end is exclusive) or None
+        self._filter_start = None
+        self._filter_end = None
+        # Active sort, applied via indexed ORDER BY in the DB
+        self._sort_column = "date"
+        self._sort_dir = "DESC"
+        # Full rows keyed by expense id; the Treeview only holds trimmed display
+        # values, so long descriptions don't bloat Tcl-side memory.
+        self._row_cache = {}
 
         self.create_widgets()
         self.update_expense_list() # Populate the expense table on startup
@@ -310,6 +522,19 @@ class ExpenseTrackerApp:
         tk.Button(self.button_frame, text="Clear Fields", command=self.clear_entries, width=button_width, bg='#9E9E9E').pack(side=tk.LEFT, padx=5) # Grey
         tk.Button(self.button_frame, text="Generate Report", command=self.generate_report_gui, width=button_width, bg='#4CAF50').pack(side=tk.LEFT, padx=5) # Green
 
+        # --- Date-Range Filter Bar ---
+        # Filtering happens in SQL (see get_expenses), never by post-filtering rows in Python
+        self.filter_frame = tk.Frame(self.master, padx=10, pady=5)
+        self.filter_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(self.filter_frame, text="From:").pack(side=tk.LEFT, padx=5)
+        self.filter_start_entry = DateEntry(self.filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.filter_start_entry.pack(side=tk.LEFT, padx=5)
+        tk.Label(self.filter_frame, text="To:").pack(side=tk.LEFT, padx=5)
+        self.filter_end_entry = DateEntry(self.filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.filter_end_entry.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.filter_frame, text="Apply Filter", command=self.apply_date_filter, bg='#2196F3').pack(side=tk.LEFT, padx=5)
+        tk.Button(self.filter_frame, text="Clear Filter", command=self.clear_date_filter, bg='#9E9E9E').pack(side=tk.LEFT, padx=5)
 
         # --- Expense List Display (using Treeview for tabular data) ---
         self.list_frame = tk.LabelFrame(self.master, text="Expenses List", padx=15, pady=10, bd=2, relief="groove")
@@ -319,9 +544,15 @@ class ExpenseTrackerApp:
         self.expense_tree = ttk.Treeview(self.list_frame, columns=columns, show="headings", style="Custom.Treeview") # Apply custom style here
         self.expense_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Configure column headings and widths
+        # Configure column headings and widths; sortable columns re-query the DB
+        # with an indexed ORDER BY instead of re-sorting rows in Python
+        sortable = {"Amount": "amount", "Category": "category", "Date": "date"}
         for col in columns:
-            self.expense_tree.heading(col, text=col, anchor=tk.W)
+            if col in sortable:
+                self.expense_tree.heading(col, text=col, anchor=tk.W,
+                                          command=lambda key=sortable[col]: self.sort_by_column(key))
+            else:
+                self.expense_tree.heading(col, text=col, anchor=tk.W)
         
         self.expense_tree.column("ID", width=50, stretch=tk.NO)
         self.expense_tree.column("Amount", width=80, stretch=tk.NO)
@@ -329,10 +560,11 @@ class ExpenseTrackerApp:
         self.expense_tree.column("Date", width=100, stretch=tk.NO)
         self.expense_tree.column("Description", width=250, stretch=tk.YES) # Description expands to fill space
 
-        # Add a scrollbar to the Treeview
-        scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.expense_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.expense_tree.config(yscrollcommand=scrollbar.set)
+        # Add a scrollbar to the Treeview; yscrollcommand is routed through
+        # _on_tree_scroll so scrolling near the bottom loads the next page.
+        self.tree_scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.expense_tree.yview)
+        self.tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.expense_tree.config(yscrollcommand=self._on_tree_scroll)
 
         # Bind row selection in Treeview to load data into input fields
         self.expense_tree.bind("<<TreeviewSelect>>", self.load_selected_expense_to_entries)
@@ -368,11 +600,9 @@ class ExpenseTrackerApp:
 
         if not date_str.strip():
             return False, "Date cannot be empty."
-        try:
-            datetime.datetime.strptime(date_str, '%Y-%m-%d') # Validate YYYY-MM-DD format
-        except ValueError:
+        if not _DATE_RE.match(date_str): # Validate YYYY-MM-DD format
             return False, "Date format must be YYYY-MM-DD."
-        
+
         return True, "" # Validation successful
 
     def add_expense_gui(self):
@@ -390,8 +620,14 @@ class ExpenseTrackerApp:
 
         amount = float(amount_str)
 
-        if self.db.add_expense(amount, category_name, date_str, description):
-            self.update_expense_list() # Refresh the displayed list
+        new_id = self.db.add_expense(amount, category_name, date_str, description)
+        if new_id:
+            # Insert the single new row directly instead of re-fetching the list
+            row = (new_id, amount, category_name, date_str, description)
+            self._row_cache[new_id] = row
+            self.expense_tree.insert("", 0, iid=str(new_id), values=self._display_values(row))
+            self._total_expenses += 1
+            self._page_offset += 1  # keep the next DB page aligned with what's shown
             self.clear_entries()      # Clear input fields for next entry
             self._show_status_message("Expense added successfully!")
         else:
@@ -405,8 +641,8 @@ class ExpenseTrackerApp:
             self._show_status_message("No expense selected for update.", is_error=True)
             return
 
-        # Extract expense ID from the selected row's values (first column)
-        expense_id = self.expense_tree.item(selected_item)['values'][0]
+        # Treeview iids are the expense ids, so no Tcl value round trip is needed
+        expense_id = int(selected_item)
 
         amount_str = self.amount_entry.get().strip()
         category_name = self.category_var.get().strip()
@@ -423,7 +659,10 @@ class ExpenseTrackerApp:
 
         if messagebox.askyesno("Confirm Update", "Are you sure you want to update this expense?"):
             if self.db.update_expense(expense_id, amount, category_name, date_str, description):
-                self.update_expense_list()
+                # Patch the single affected row in place
+                row = (expense_id, amount, category_name, date_str, description)
+                self._row_cache[expense_id] = row
+                self.expense_tree.item(selected_item, values=self._display_values(row))
                 self.clear_entries()
                 self._show_status_message(f"Expense ID {expense_id} updated successfully!")
             else:
@@ -437,12 +676,16 @@ class ExpenseTrackerApp:
             self._show_status_message("No expense selected for deletion.", is_error=True)
             return
 
-        # Extract expense ID from the selected row
-        expense_id = self.expense_tree.item(selected_item)['values'][0]
+        # Treeview iids are the expense ids
+        expense_id = int(selected_item)
 
         if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete expense ID {expense_id}?"):
             if self.db.delete_expense(expense_id):
-                self.update_expense_list()
+                # Remove the single affected row in place
+                self.expense_tree.delete(selected_item)
+                self._row_cache.pop(expense_id, None)
+                self._total_expenses -= 1
+                self._page_offset -= 1  # keep the next DB page aligned with what's shown
                 self.clear_entries() # Clear fields after deletion
                 self._show_status_message(f"Expense ID {expense_id} deleted successfully!")
             else:
@@ -457,30 +700,93 @@ class ExpenseTrackerApp:
         
 
     def update_expense_list(self):
-        """Fetches all expenses from the database and repopulates the Treeview display."""
+        """Resets the Treeview and loads the first page of expenses from the database."""
         # Clear all existing items in the Treeview
         for item in self.expense_tree.get_children():
             self.expense_tree.delete(item)
 
-        expenses = self.db.get_expenses()
-        if expenses:
-            for expense in expenses:
-                self.expense_tree.insert("", tk.END, values=expense)
-            self._show_status_message(f"Loaded {len(expenses)} expenses.")
+        self._page_offset = 0
+        self._row_cache.clear()
+        self._total_expenses = self.db.get_expense_count(
+            start_date=self._filter_start, end_date=self._filter_end)
+        if self._total_expenses:
+            self._load_next_page()
+        elif self._filter_start or self._filter_end:
+            self._show_status_message("No expenses in the selected date range.")
         else:
             self._show_status_message("No expenses recorded yet.")
 
+    def apply_date_filter(self):
+        """Applies the filter bar's date range to the expense list."""
+        start = self.filter_start_entry.get_date()
+        end = self.filter_end_entry.get_date()
+        if end < start:
+            messagebox.showerror("Input Error", "'To' date must not be before 'From' date.")
+            self._show_status_message("Invalid date range.", is_error=True)
+            return
+        self._filter_start = start.isoformat()
+        # The DB uses a half-open range, so pass the day after the chosen end
+        # to keep it inclusive from the user's point of view.
+        self._filter_end = (end + datetime.timedelta(days=1)).isoformat()
+        self.update_expense_list()
+
+    def sort_by_column(self, column):
+        """Sorts the expense list by a column, toggling direction on repeat clicks."""
+        if self._sort_column == column:
+            self._sort_dir = "ASC" if self._sort_dir == "DESC" else "DESC"
+        else:
+            self._sort_column = column
+            self._sort_dir = "DESC"
+        self.update_expense_list()
+
+    def clear_date_filter(self):
+        """Removes the date-range filter and reloads the full expense list."""
+        self._filter_start = None
+        self._filter_end = None
+        self.update_expense_list()
+
+    def _load_next_page(self):
+        """Fetches and appends the next page of expenses to the Treeview."""
+        expenses = self.db.get_expenses(start_date=self._filter_start, end_date=self._filter_end,
+                                        limit=self.PAGE_SIZE, offset=self._page_offset,
+                                        order_by=self._sort_column, order_dir=self._sort_dir)
+        for expense in expenses:
+            self._row_cache[expense[0]] = expense
+            self.expense_tree.insert("", tk.END, iid=str(expense[0]), values=self._display_values(expense))
+        self._page_offset += len(expenses)
+        self._show_status_message(f"Loaded {self._page_offset} of {self._total_expenses} expenses.")
+
+    @staticmethod
+    def _display_values(expense):
+        """Returns the row values as shown in the Treeview, with the description trimmed.
+
+        The full row stays in `_row_cache`; only the trimmed copy crosses into Tcl.
+        """
+        description = expense[4] or ""
+        if len(description) > 100:
+            description = description[:97] + "..."
+        return (*expense[:4], description)
+
+    def _on_tree_scroll(self, first, last):
+        """Forwards scroll position to the scrollbar and lazy-loads the next page near the bottom."""
+        self.tree_scrollbar.set(first, last)
+        if float(last) >= 0.9 and self._page_offset < self._total_expenses:
+            self._load_next_page()
+
     def load_selected_expense_to_entries(self, event):
-        """Loads details of the selected expense from the Treeview into the input fields."""
+        """Loads details of the selected expense from the row cache into the input fields."""
         selected_item = self.expense_tree.focus()
         if selected_item:
-            values = self.expense_tree.item(selected_item)['values']
+            # Rows are keyed by expense id; the cache holds the untrimmed values
+            values = self._row_cache.get(int(selected_item))
+            if values is None:
+                return
             # values are (ID, Amount, Category, Date, Description)
             self.clear_entries() # Clear current fields first
             self.amount_entry.insert(0, str(values[1]))  # Amount
             self.category_var.set(values[2])           # Category
             self.date_entry.set_date(values[3])         # Date
-            self.description_entry.insert(0, values[4]) # Description
+            self.description_entry.insert(0, values[4] or "") # Description
             self._show_status_message(f"Expense ID {values[0]} loaded for editing.")
 
     def show_expense_list_view(self):
@@ -488,12 +794,12 @@ class ExpenseTrackerApp:
         # Restore packing of input, button, and list frames
         self.input_frame.pack(fill=tk.X, padx=10, pady=10)
         self.button_frame.pack(fill=tk.X, pady=5)
+        self.filter_frame.pack(fill=tk.X, pady=5)
         self.list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Destroy the chart frame to remove it completely
+
+        # Hide (not destroy) the chart frame so the figure/canvas are reused
         if self.chart_frame:
-            self.chart_frame.destroy()
-            self.chart_frame = None # Clear reference
+            self.chart_frame.pack_forget()
         #self._show_status_message("Back to expense list.")
 
     def generate_report_gui(self):
@@ -505,46 +811,40 @@ class ExpenseTrackerApp:
             self._show_status_message("No data for report.", is_error=True)
             return
 
-        categories = list(spending_data.keys())
-        amounts = list(spending_data.values())
+        categories, amounts = zip(*spending_data)
 
         # Hide the expense list and input/action buttons to make space for the report
         self.input_frame.pack_forget()
         self.button_frame.pack_forget()
+        self.filter_frame.pack_forget()
         self.list_frame.pack_forget()
 
-        # Clean up any previously displayed chart and its frame
-        if self.chart_frame:
-            self.chart_frame.destroy()
-            self.chart_frame = None
+        # Build the chart frame, figure and canvas only once; later reports just
+        # clear the axes and redraw, skipping full figure construction.
+        if self.chart_frame is None:
+            self.chart_frame = tk.LabelFrame(self.master, text="Spending Report by Category", padx=15, pady=10, bd=2, relief="groove")
+
+            # Add a button to hide the report and show the expense list again -- PACKED FIRST
+            tk.Button(self.chart_frame, text="Back to Expenses", command=self.show_expense_list_view, bg='#607D8B', fg='white').pack(side=tk.BOTTOM, pady=10)
+
+            # Embed the Matplotlib figure into the Tkinter window -- PACKED AFTER THE BUTTON
+            self._report_fig, self._report_ax = plt.subplots(figsize=(10, 6)) # A good default size for Tkinter embedding
+            self._report_canvas = FigureCanvasTkAgg(self._report_fig, master=self.chart_frame)
+            self._report_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
 
-        # Create a new frame specifically for the chart
-        self.chart_frame = tk.LabelFrame(self.master, text="Spending Report by Category", padx=15, pady=10, bd=2, relief="groove")
         self.chart_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        # Create the Matplotlib figure and axes
-        fig, ax = plt.subplots(figsize=(10, 6)) # A good default size for Tkinter embedding
-        ax.bar(categories, amounts, color='skyblue')
-        ax.set_xlabel("Category")
-        ax.set_ylabel("Total Amount")
-        ax.set_title("Expense Breakdown by Category")
-        ax.tick_params(axis='x', rotation=45) # Rotate category labels for readability
-        plt.tight_layout() # Automatically adjust plot parameters for a tight layout
-
-        # Add a button to hide the report and show the expense list again -- PACKED FIRST
-        tk.Button(self.chart_frame, text="Back to Expenses", command=self.show_expense_list_view, bg='#607D8B', fg='white').pack(side=tk.BOTTOM, pady=10)
-
-        # Embed the Matplotlib figure into the Tkinter window -- PACKED AFTER THE BUTTON
-        self.chart_canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.chart_canvas.draw()
-        self.chart_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-        
+        self._report_ax.clear()
+        self._report_ax.bar(categories, amounts, color='skyblue')
+        self._report_ax.set_xlabel("Category")
+        self._report_ax.set_ylabel("Total Amount")
+        self._report_ax.set_title("Expense Breakdown by Category")
+        self._report_ax.tick_params(axis='x', rotation=45) # Rotate category labels for readability
+        self._report_fig.tight_layout() # Automatically adjust plot parameters for a tight layout
+        self._report_canvas.draw_idle() # Coalesces redraws on the Tk event loop
+
         # Force Tkinter to process geometry updates immediately for proper rendering
         self.master.update_idletasks()
-        self.master.update() 
-        
-        # Close the Matplotlib figure to free up memory (important when embedding)
-        plt.close(fig)
 
         #self._show_status_message("Spending report generated. Click 'Back to Expenses' to return to list.")
 